@@ -6,12 +6,13 @@ This script demonstrates how to use the FlexportTariffClient to:
 2. Search for HTS codes by product description
 """
 
-import json
+import asyncio
 from datetime import datetime
-from flexport_tariff_client import FlexportTariffClient
+import orjson
+from flexport_tariff_client import FlexportTariffClient, AsyncFlexportTariffClient
 
 
-def example_calculate_tariff():
+def example_calculate_tariff(client: FlexportTariffClient):
     """
     Example: Calculate tariff for importing men's trousers from China
     """
@@ -19,22 +20,22 @@ def example_calculate_tariff():
     print("Example 1: Calculate Tariff for Men's Trousers from China")
     print("=" * 60)
 
-    # Use context manager to automatically handle browser lifecycle
-    with FlexportTariffClient(headless=False) as client:
-        result = client.calculate_tariff(
-            hts_code="6203.42.4015",  # Men's trousers of cotton
-            country_of_origin="CN",  # China
-            shipment_value=10000.00,  # $10,000 USD
-            entry_date="2025-01-15"  # January 15, 2025
-        )
+    result = client.calculate_tariff(
+        hts_code="6203.42.4015",  # Men's trousers of cotton
+        country_of_origin="CN",  # China
+        shipment_value=10000.00,  # $10,000 USD
+        entry_date="2025-01-15"  # January 15, 2025
+    )
 
-        print("\nResults:")
-        print(json.dumps(result, indent=2))
+    print("\nResults:")
+    print(orjson.dumps(result, option=orjson.OPT_INDENT_2).decode())
 
 
-def example_multiple_countries():
+async def example_multiple_countries(client: AsyncFlexportTariffClient):
     """
     Example: Compare tariffs from different countries for the same product
+
+    The per-country calculations run concurrently on one shared browser.
     """
     print("\n" + "=" * 60)
     print("Example 2: Compare Tariffs from Different Countries")
@@ -50,25 +51,29 @@ def example_multiple_countries():
     hts_code = "8517.62.0050"  # Smartphones
     shipment_value = 50000.00
 
-    with FlexportTariffClient(headless=True) as client:
-        for country_code, country_name in countries.items():
-            print(f"\n--- Calculating for {country_name} ({country_code}) ---")
-
-            result = client.calculate_tariff(
-                hts_code=hts_code,
-                country_of_origin=country_code,
-                shipment_value=shipment_value,
-                entry_date=datetime.now().strftime("%Y-%m-%d")
-            )
+    today = datetime.now().strftime("%Y-%m-%d")
+    results = await asyncio.gather(*[
+        client.calculate_tariff(
+            hts_code=hts_code,
+            country_of_origin=country_code,
+            shipment_value=shipment_value,
+            entry_date=today
+        )
+        for country_code in countries
+    ])
 
-            print(f"Duty Rate: {result.get('duty_rate', 'N/A')}")
-            print(f"Duty Amount: {result.get('duty_amount', 'N/A')}")
-            print(f"Total Landed Cost: {result.get('total_landed_cost', 'N/A')}")
+    for (country_code, country_name), result in zip(countries.items(), results):
+        print(f"\n--- Calculating for {country_name} ({country_code}) ---")
+        print(f"Duty Rate: {result.duty_rate}")
+        print(f"Duty Amount: {result.duty_amount}")
+        print(f"Total Landed Cost: {result.total_landed_cost}")
 
 
-def example_search_hts():
+async def example_search_hts(client: AsyncFlexportTariffClient):
     """
     Example: Search for HTS codes using a product description
+
+    The searches run concurrently, one pooled browser context each.
     """
     print("\n" + "=" * 60)
     print("Example 3: Search for HTS Codes")
@@ -80,20 +85,22 @@ def example_search_hts():
         "wooden furniture"
     ]
 
-    with FlexportTariffClient(headless=False) as client:
-        for description in product_descriptions:
-            print(f"\nSearching for: '{description}'")
+    all_results = await asyncio.gather(*[
+        client.search_hts_code(description, limit=5) for description in product_descriptions
+    ])
 
-            results = client.search_hts_code(description)
+    for description, results in zip(product_descriptions, all_results):
+        print(f"\nSearching for: '{description}'")
+        print(f"Top {len(results)} results:")
+        for i, result in enumerate(results, 1):
+            print(f"  {i}. {result.get('hts_code', 'N/A')}: {result.get('description', 'N/A')[:100]}")
 
-            print(f"Found {len(results)} results:")
-            for i, result in enumerate(results[:5], 1):  # Show top 5 results
-                print(f"  {i}. {result.get('hts_code', 'N/A')}: {result.get('description', 'N/A')[:100]}")
 
-
-def example_time_comparison():
+async def example_time_comparison(client: AsyncFlexportTariffClient):
     """
     Example: Compare tariffs for the same product at different dates
+
+    The per-date calculations run concurrently on one shared browser.
     """
     print("\n" + "=" * 60)
     print("Example 4: Compare Tariffs at Different Dates")
@@ -109,42 +116,52 @@ def example_time_comparison():
         "2025-01-01"
     ]
 
-    with FlexportTariffClient(headless=True) as client:
-        for entry_date in dates:
-            print(f"\n--- Entry Date: {entry_date} ---")
+    results = await asyncio.gather(*[
+        client.calculate_tariff(
+            hts_code=hts_code,
+            country_of_origin=country,
+            shipment_value=value,
+            entry_date=entry_date
+        )
+        for entry_date in dates
+    ])
+
+    for entry_date, result in zip(dates, results):
+        print(f"\n--- Entry Date: {entry_date} ---")
+        print(f"Duty Rate: {result.duty_rate}")
+        print(f"Applicable Tariffs: {', '.join(result.applicable_tariffs)}")
 
-            result = client.calculate_tariff(
-                hts_code=hts_code,
-                country_of_origin=country,
-                shipment_value=value,
-                entry_date=entry_date
-            )
 
-            print(f"Duty Rate: {result.get('duty_rate', 'N/A')}")
-            print(f"Applicable Tariffs: {', '.join(result.get('applicable_tariffs', []))}")
+async def run_concurrent_examples():
+    """Run the examples that issue many calculations at once."""
+    async with AsyncFlexportTariffClient(headless=True) as client:
+        await example_multiple_countries(client)
+        await example_search_hts(client)
+        await example_time_comparison(client)
 
 
 def main():
     """
     Run all examples.
 
-    Note: Set headless=False in any example to see the browser in action.
+    The sync and async examples each share one client, so the browser is
+    launched once per group rather than once per example.
+    Note: Set headless=False below to see the browser in action.
     """
     print("\n" + "=" * 60)
     print("Flexport Tariff Client - Example Usage")
     print("=" * 60)
     print("\nNOTE: These examples require the actual page structure to be")
-    print("analyzed first. Run 'inspect_page.py' to discover the correct")
-    print("selectors, then update 'flexport_tariff_client.py' accordingly.\n")
+    print("analyzed first. Run 'inspect_page.py' to generate the correct")
+    print("selectors in 'tariff_selectors.py'.\n")
 
     try:
-        # Run example 1 - basic tariff calculation
-        example_calculate_tariff()
+        with FlexportTariffClient(headless=True) as client:
+            # Run example 1 - basic tariff calculation
+            example_calculate_tariff(client)
 
-        # Uncomment to run other examples:
-        # example_multiple_countries()
-        # example_search_hts()
-        # example_time_comparison()
+        # Run examples 2, 3 and 4 - concurrent calculations and searches
+        asyncio.run(run_concurrent_examples())
 
     except Exception as e:
         print(f"\nError: {e}")
@@ -5,14 +5,652 @@ This client provides programmatic access to tariffs.flexport.com
 to calculate HTS codes, duties, and tariffs for import shipments.
 
 Note: tariffs.flexport.com does not have a public API, so this client
-uses browser automation to interact with the website.
+uses browser automation to interact with the website. Once inspect_page.py
+has discovered the internal tariff endpoint, the client can call it
+directly with use_api=True and skip the browser entirely.
+
+Set FLEXPORT_CDP_URL (or pass cdp_url) to attach to an already running
+Chrome over the DevTools protocol instead of launching a new browser.
 """
 
+import asyncio
+import copy
 import json
+import os
+import re
+import shelve
 import time
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, Optional, Any
-from playwright.sync_api import sync_playwright, Page, Browser, Playwright
+from functools import partial
+from typing import Callable, Dict, List, Optional, Any, Tuple, Union
+from urllib.parse import urlsplit
+import httpx
+import orjson
+from playwright.sync_api import sync_playwright, Page, Browser, BrowserContext, Playwright, Request, Response, Route
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import async_playwright
+from playwright.async_api import Browser as AsyncBrowser
+from playwright.async_api import BrowserContext as AsyncBrowserContext
+from playwright.async_api import Page as AsyncPage
+from playwright.async_api import Playwright as AsyncPlaywright
+from playwright.async_api import Route as AsyncRoute
+from playwright.async_api import TimeoutError as AsyncPlaywrightTimeoutError
+
+try:
+    from tariff_selectors import SELECTORS as GENERATED_SELECTORS
+except ImportError:
+    # inspect_page.py has not been run yet
+    GENERATED_SELECTORS = {}
+
+
+@dataclass(slots=True)
+class TariffResult:
+    """
+    Result of a tariff calculation.
+
+    Attributes:
+        hts_code: The HTS code the calculation was for
+        hts_description: Description of the HTS code
+        country_of_origin: Country of origin as reported by the site
+        duty_rate: The duty rate percentage
+        duty_amount: The calculated duty amount in USD
+        total_landed_cost: Total cost including duties
+        applicable_tariffs: List of applicable tariff sections
+        raw_html: Full page HTML, only captured with debug=True
+        error: Set if the results could not be read from the page
+    """
+
+    hts_code: Optional[str] = None
+    hts_description: Optional[str] = None
+    country_of_origin: Optional[str] = None
+    duty_rate: Optional[str] = None
+    duty_amount: Optional[str] = None
+    total_landed_cost: Optional[str] = None
+    applicable_tariffs: List[str] = field(default_factory=list)
+    raw_html: Optional[str] = None
+    error: Optional[str] = None
+
+    def has_values(self) -> bool:
+        """Return True if any of VALUE_FIELDS was read."""
+        return any(getattr(self, name) for name in VALUE_FIELDS)
+
+
+# Keys that may carry each result field in the tariff XHR payload
+RESPONSE_FIELDS = {
+    "hts_code": ("hts_code", "htsCode"),
+    "hts_description": ("hts_description", "htsDescription", "description"),
+    "country_of_origin": ("country_of_origin", "countryOfOrigin", "origin"),
+    "duty_rate": ("duty_rate", "dutyRate"),
+    "duty_amount": ("duty_amount", "dutyAmount"),
+    "total_landed_cost": ("total_landed_cost", "totalLandedCost"),
+    "applicable_tariffs": ("applicable_tariffs", "applicableTariffs", "tariffs"),
+}
+
+# Keys that may name a tariff section when the payload lists them as objects
+TARIFF_NAME_KEYS = ("name", "section", "code", "title", "description")
+
+# Keys that may carry each calculate_tariff argument in the tariff request body
+REQUEST_FIELDS = {
+    "hts_code": ("hts_code", "htsCode", "hts"),
+    "country_of_origin": ("country_of_origin", "countryOfOrigin", "origin", "country"),
+    "shipment_value": ("shipment_value", "shipmentValue", "customsValue", "value"),
+    "entry_date": ("entry_date", "entryDate", "date"),
+    "quantity": ("quantity", "qty"),
+    "unit": ("unit", "uom"),
+}
+
+# Request headers not replayed from the recorded calculation: hop-by-hop
+# headers, and those httpx sets itself for each request
+UNREPLAYED_HEADERS = {
+    "connection",
+    "keep-alive",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "te",
+    "trailer",
+    "transfer-encoding",
+    "upgrade",
+    "host",
+    "content-length",
+    "content-type",
+    "accept-encoding",
+}
+
+# Result fields that only a completed calculation carries
+VALUE_FIELDS = ("duty_rate", "duty_amount", "total_landed_cost")
+
+# Resource types of requests issued by the page's scripts
+XHR_RESOURCE_TYPES = {"xhr", "fetch"}
+
+# URL paths that look like the tariff calculation endpoint, used until
+# inspect_page.py has recorded the exact one
+TARIFF_PATH_PATTERN = re.compile(r"calculat|tariff|dut(y|ies)", re.IGNORECASE)
+
+# CSS selectors for the calculator page. These defaults are broad guesses;
+# inspect_page.py generates tariff_selectors.py with exact selectors for
+# the live page, which override them.
+DEFAULT_SELECTORS = {
+    "hts_input": 'input[placeholder*="HTS"], input[name*="hts"], input[id*="hts"]',
+    "country_input": 'select[name*="country"], select[id*="country"], input[placeholder*="country"]',
+    "country_option": '[role="option"]',
+    "value_input": 'input[placeholder*="value"], input[name*="value"], input[type="number"]',
+    "date_input": 'input[type="date"], input[placeholder*="date"], input[name*="date"]',
+    "calculate_button": 'button:has-text("Calculate"), button[type="submit"], input[type="submit"]',
+    "search_input": 'input[placeholder*="search"], input[placeholder*="product"]',
+    "search_result": '[class*="search-result"], [class*="hts-result"]',
+    "search_result_code": '[class*="code"]',
+    "duty_rate": '[class*="duty"], [class*="rate"], [id*="duty"]',
+    "total_landed_cost": '[class*="total"], [class*="landed"], [id*="total"]',
+    "hts_description": '[class*="description"], [class*="hts-desc"]',
+}
+
+# Result fields scraped from the page when the XHR payload is unusable
+DOM_RESULT_FIELDS = ("duty_rate", "total_landed_cost", "hts_description")
+
+# Reads the text of each {field: selector} entry in one evaluate round trip
+EXTRACT_RESULTS_JS = """(selectors) => {
+    const results = {};
+    for (const [field, selector] of Object.entries(selectors)) {
+        const element = document.querySelector(selector);
+        results[field] = element ? element.innerText : null;
+    }
+    return results;
+}"""
+
+# True once the {field: selector} texts differ from a snapshot taken with
+# EXTRACT_RESULTS_JS and at least one field has rendered
+RESULTS_CHANGED_JS = """([selectors, before]) => {
+    const now = {};
+    for (const [field, selector] of Object.entries(selectors)) {
+        const element = document.querySelector(selector);
+        now[field] = element ? element.innerText : null;
+    }
+    const fields = Object.keys(now);
+    return fields.some(field => now[field] !== null)
+        && fields.some(field => now[field] !== before[field]);
+}"""
+
+# Reads up to limit search result rows (all if null) in one evaluate round trip
+EXTRACT_SEARCH_JS = """([rowSelector, codeSelector, limit]) => {
+    let rows = Array.from(document.querySelectorAll(rowSelector));
+    if (limit !== null) {
+        rows = rows.slice(0, limit);
+    }
+    return rows.map(row => {
+        const code = row.querySelector(codeSelector);
+        return {hts_code: code ? code.innerText : null, description: row.innerText};
+    });
+}"""
+
+# How long to wait for a form field before reporting it missing (ms)
+FIELD_TIMEOUT = 5000
+
+# Once the HTS field has passed Playwright's actionability checks the form
+# is hydrated, so the remaining fields skip those checks and their
+# post-action waits; the calculate XHR is the single point we wait on
+FAST_FILL = {"force": True, "no_wait_after": True}
+
+# How long to wait for the country autocomplete to offer a match (ms)
+OPTION_TIMEOUT = 2000
+
+# How long to wait for a recognisable calculation XHR before reading the
+# results from the page instead (ms)
+RESPONSE_TIMEOUT = 10000
+
+# Chromium flags for lean headless runs
+LAUNCH_ARGS = [
+    "--disable-gpu",
+    "--disable-dev-shm-usage",
+    "--no-sandbox",
+    "--disable-features=VizDisplayCompositor",
+]
+
+# Resource types the scraper never reads
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media", "stylesheet"}
+
+# Analytics and telemetry hosts
+BLOCKED_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "segment.io",
+    "segment.com",
+    "datadoghq",
+    "hotjar.com",
+)
+
+# Selectors in use: the defaults, overridden by any that inspect_page.py generated
+SELECTORS = {**DEFAULT_SELECTORS, **GENERATED_SELECTORS}
+
+
+def result_selectors() -> Dict[str, str]:
+    """Return the selectors for DOM_RESULT_FIELDS, as passed to EXTRACT_RESULTS_JS."""
+    return {name: SELECTORS[name] for name in DOM_RESULT_FIELDS}
+
+
+def search_args(limit: Optional[int]) -> list:
+    """Return the argument list passed to EXTRACT_SEARCH_JS."""
+    return [SELECTORS["search_result"], SELECTORS["search_result_code"], limit]
+
+
+def exact_text(text: str) -> re.Pattern:
+    """
+    Return a pattern matching an element whose whole text is text.
+
+    has_text with a plain string is a case-insensitive substring match,
+    so "IN" would also pick "China" or "Argentina".
+    """
+    return re.compile(rf"^\s*{re.escape(text.strip())}\s*$", re.IGNORECASE)
+
+
+def word_text(text: str) -> re.Pattern:
+    """Return a pattern matching text as a whole word, e.g. "CN" in "China (CN)"."""
+    return re.compile(rf"\b{re.escape(text.strip())}\b", re.IGNORECASE)
+
+
+def today() -> str:
+    """Return today's date in the YYYY-MM-DD format used for entry dates."""
+    return datetime.now().strftime("%Y-%m-%d")
+
+
+def saved_storage_state(path: Optional[str]) -> Optional[str]:
+    """Return path if it names an existing storage state file to seed contexts with."""
+    if path and os.path.exists(path):
+        return path
+    return None
+
+
+def should_block_request(request: Request) -> bool:
+    """Return True if the request is not needed to read tariff results."""
+    if request.resource_type in BLOCKED_RESOURCE_TYPES:
+        return True
+    url = request.url.lower()
+    return any(host in url for host in BLOCKED_HOSTS)
+
+
+def block_unneeded_resources(route: Route):
+    """Route handler that aborts requests matched by should_block_request."""
+    if should_block_request(route.request):
+        route.abort()
+    else:
+        route.continue_()
+
+
+async def block_unneeded_resources_async(route: AsyncRoute):
+    """Async route handler that aborts requests matched by should_block_request."""
+    if should_block_request(route.request):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+def is_tariff_response(response: Response, endpoint_path: Optional[str] = None) -> bool:
+    """
+    Return True if the response answers the tariff calculation XHR.
+
+    Matches on the request rather than the URL alone, since every response
+    from tariffs.flexport.com carries "tariff" in its hostname.
+
+    Args:
+        response: Response to check
+        endpoint_path: Path of the endpoint recorded by inspect_page.py; if
+            None, the path is matched against TARIFF_PATH_PATTERN
+    """
+    request = response.request
+    if request.method != "POST" or request.resource_type not in XHR_RESOURCE_TYPES:
+        return False
+    path = urlsplit(response.url).path
+    if endpoint_path:
+        return path.rstrip("/") == endpoint_path.rstrip("/")
+    return bool(TARIFF_PATH_PATTERN.search(path))
+
+
+def tariff_response_matcher(endpoint_path: Optional[str]) -> Callable[[Response], bool]:
+    """Return an expect_response predicate for the tariff calculation XHR."""
+    return partial(is_tariff_response, endpoint_path=endpoint_path)
+
+
+def tariff_names(value: Any) -> List[str]:
+    """
+    Normalise an applicable tariffs value from a payload to a list of strings.
+
+    Accepts a single value or a list; objects are reduced to the first of
+    TARIFF_NAME_KEYS they carry.
+    """
+    if not isinstance(value, list):
+        value = [value]
+
+    names = []
+    for item in value:
+        if isinstance(item, dict):
+            item = next((item[key] for key in TARIFF_NAME_KEYS if item.get(key) is not None), item)
+        if item is not None:
+            names.append(str(item))
+    return names
+
+
+def parse_tariff_payload(payload: Any) -> Optional[TariffResult]:
+    """
+    Build results from a tariff calculation JSON payload.
+
+    Args:
+        payload: Decoded JSON body of the tariff calculation response
+
+    Returns:
+        TariffResult with the fields found, or None if the payload
+        carries none of VALUE_FIELDS
+    """
+    if not isinstance(payload, dict):
+        return None
+    # Unwrap GraphQL-style envelopes
+    if isinstance(payload.get("data"), dict):
+        payload = payload["data"]
+
+    values: Dict[str, Any] = {}
+    for name, keys in RESPONSE_FIELDS.items():
+        for key in keys:
+            if payload.get(key) is not None:
+                if name == "applicable_tariffs":
+                    values[name] = tariff_names(payload[key])
+                else:
+                    values[name] = str(payload[key])
+                break
+
+    if not any(name in values for name in VALUE_FIELDS):
+        # Descriptions or envelopes alone do not make a calculation
+        return None
+    return TariffResult(**values)
+
+
+def parse_tariff_body(body: bytes) -> Optional[TariffResult]:
+    """
+    Build results from the raw body of the tariff calculation response.
+
+    Returns:
+        TariffResult, or None if the body is not JSON or carries none of
+        VALUE_FIELDS, in which case the results are read from the page
+    """
+    try:
+        payload = orjson.loads(body)
+    except orjson.JSONDecodeError:
+        return None
+    return parse_tariff_payload(payload)
+
+
+def results_from_dom(texts: Dict[str, Optional[str]], raw_html: Optional[str] = None) -> TariffResult:
+    """Build results from the field texts returned by EXTRACT_RESULTS_JS."""
+    results = TariffResult(raw_html=raw_html)
+    for name, text in texts.items():
+        setattr(results, name, text)
+    return results
+
+
+def build_tariff_payload(arguments: Dict[str, Any], template: Any = None) -> Dict[str, Any]:
+    """
+    Build the tariff request body for the given calculate_tariff arguments.
+
+    Args:
+        arguments: calculate_tariff arguments keyed like REQUEST_FIELDS
+        template: Request body captured by inspect_page.py; its keys (and
+            those of a GraphQL "variables" object) are kept, with the values
+            of recognised keys replaced by the arguments
+
+    Returns:
+        Dictionary to post as JSON; snake_case argument names if no usable
+        template was captured
+    """
+    if not isinstance(template, dict):
+        return {name: value for name, value in arguments.items() if value is not None}
+
+    payload = dict(template)
+    if isinstance(payload.get("variables"), dict):
+        payload["variables"] = build_tariff_payload(arguments, payload["variables"])
+        return payload
+
+    for name, value in arguments.items():
+        key = next((key for key in REQUEST_FIELDS[name] if key in payload), None)
+        if value is None:
+            # Do not resend an optional value from the captured calculation
+            if key is not None:
+                del payload[key]
+        else:
+            payload[key or name] = value
+    return payload
+
+
+def replay_headers(headers: Optional[Dict[str, str]]) -> Dict[str, str]:
+    """
+    Return the recorded request headers worth sending with API calls.
+
+    Keeps headers such as authorization, CSRF tokens, origin and referer;
+    drops UNREPLAYED_HEADERS and HTTP/2 pseudo-headers.
+    """
+    return {
+        name: value
+        for name, value in (headers or {}).items()
+        if not name.startswith(":") and name.lower() not in UNREPLAYED_HEADERS
+    }
+
+
+def load_tariff_endpoint(inspection_path: str = "page_inspection.json") -> Optional[Dict[str, Any]]:
+    """
+    Read the tariff endpoint discovered by inspect_page.py.
+
+    Args:
+        inspection_path: Path to the inspector's output file
+
+    Returns:
+        Dictionary with the endpoint url, method, captured headers and
+        post_body, or None if it has not been discovered yet
+    """
+    try:
+        with open(inspection_path) as f:
+            findings = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    return findings.get("tariff_endpoint") or None
+
+
+class PooledPage:
+    """
+    A client page together with its calculator form locators.
+
+    Locators are built once when the page is opened and reused by every
+    call, instead of re-running the selector lists each time. Locator
+    construction is synchronous in both Playwright APIs, so this class
+    serves the sync and async clients alike.
+
+    Output a previous call rendered stays in place until the page
+    navigates, and could be read back as the next call's:
+
+    - has_results is set after a search, or a calculation that had to be
+      read from the DOM. Those calls depend on the DOM, so the page is
+      reloaded before it is filled again.
+    - shows_calculation is set after a calculation read from its XHR
+      payload. The page is reused as is; the next call snapshots the old
+      results before submitting, so a DOM fallback can wait for them to
+      change instead of reading them back.
+    """
+
+    def __init__(self, page: Any, selectors: Dict[str, str]):
+        """
+        Args:
+            page: A sync or async Playwright page
+            selectors: Selector names mapped to CSS selectors
+        """
+        self.page = page
+        self.has_results = False
+        self.shows_calculation = False
+        self.hts_input = page.locator(selectors["hts_input"]).first
+        self.country_input = page.locator(selectors["country_input"]).first
+        self.value_input = page.locator(selectors["value_input"]).first
+        self.date_input = page.locator(selectors["date_input"])
+        self.calculate_button = page.get_by_role(
+            "button", name=re.compile("calculate", re.IGNORECASE)
+        ).or_(page.locator(selectors["calculate_button"])).first
+        self.country_options = page.locator(selectors["country_option"])
+        self.search_input = page.locator(selectors["search_input"]).first
+        self.search_results = page.locator(selectors["search_result"])
+
+    def needs_reload(self, base_url: str) -> bool:
+        """Return True if the page must be reloaded before the next call."""
+        return self.has_results or self.page.url.rstrip("/") != base_url
+
+    def country_option_choices(self, country: str) -> list:
+        """
+        Return country option locators in order of preference.
+
+        An option whose whole text is country comes first, then one naming
+        it as a word (e.g. "China (CN)"), then the first suggestion, which
+        is what typing and pressing Enter would have picked.
+        """
+        return [
+            self.country_options.filter(has_text=exact_text(country)),
+            self.country_options.filter(has_text=word_text(country)),
+            self.country_options,
+        ]
+
+    def mark_loaded(self):
+        """Record that the page has just been (re)loaded and shows no output."""
+        self.has_results = False
+        self.shows_calculation = False
+
+    def mark_payload_read(self):
+        """Record that a calculation was read from its payload, not the DOM."""
+        self.has_results = False
+        self.shows_calculation = True
+
+
+class TariffCache:
+    """
+    Memoizes tariff calculation results.
+
+    Results are keyed on the normalized calculation inputs and held in
+    memory; when a path is given they are also persisted with shelve so
+    later runs can reuse them. Rates for past entry dates do not change, so
+    those entries never expire. Entries for today or later are kept for
+    ttl seconds, since announced tariff changes can still alter them.
+
+    Results are copied on the way in and out, so callers can modify what
+    they are given without changing later cache hits.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: float = 24 * 60 * 60):
+        """
+        Initialize the cache.
+
+        Args:
+            path: File to persist results to (in-memory only if None)
+            ttl: Lifetime in seconds of results for current or future dates
+        """
+        self.path = os.path.expanduser(path) if path else None
+        self.ttl = ttl
+        self._memory: Dict[Tuple, Tuple[float, Any]] = {}
+        self._shelf: Optional[shelve.Shelf] = None
+
+    @staticmethod
+    def make_key(
+        hts_code: str,
+        country_of_origin: str,
+        shipment_value: float,
+        entry_date: str,
+        quantity: Optional[float] = None,
+        unit: Optional[str] = None
+    ) -> Tuple:
+        """Build a cache key from calculate_tariff arguments."""
+        return (
+            hts_code.strip(),
+            country_of_origin.strip().upper(),
+            round(shipment_value, 2),
+            entry_date,
+            quantity,
+            unit,
+        )
+
+    def get(self, key: Tuple) -> Optional[Any]:
+        """Return the cached result for key, or None if missing or expired."""
+        entry = self._memory.get(key)
+        if entry is None and self.path:
+            try:
+                entry = self._open().get(self._disk_key(key))
+            except Exception:
+                # Unreadable entry, e.g. pickled from a class this process
+                # cannot import; recompute and overwrite it
+                entry = None
+            if entry is not None:
+                self._memory[key] = entry
+
+        if entry is None:
+            return None
+        stored_at, result = entry
+        if self._is_expired(key, stored_at):
+            return None
+        return copy.deepcopy(result)
+
+    def set(self, key: Tuple, result: Any):
+        """Store a result under key."""
+        entry = (time.time(), copy.deepcopy(result))
+        self._memory[key] = entry
+        if self.path:
+            self._open()[self._disk_key(key)] = entry
+
+    def remember(self, key: Tuple, result: TariffResult):
+        """Store a calculation result under key if it is worth reusing."""
+        # A scrape that timed out yields no values; never store it
+        if result.error is None and result.has_values():
+            self.set(key, result)
+
+    def close(self):
+        """Flush and close the on-disk store, if any."""
+        if self._shelf is not None:
+            self._shelf.close()
+            self._shelf = None
+
+    def _open(self) -> shelve.Shelf:
+        """Open the on-disk store on first use."""
+        if self._shelf is None:
+            self._shelf = shelve.open(self.path)
+        return self._shelf
+
+    def _is_expired(self, key: Tuple, stored_at: float) -> bool:
+        """Past entry dates never expire; others expire after ttl."""
+        entry_date = key[3]
+        if entry_date < today():
+            return False
+        return time.time() - stored_at > self.ttl
+
+    @staticmethod
+    def _disk_key(key: Tuple) -> str:
+        """shelve only accepts string keys."""
+        return "|".join(str(part) for part in key)
+
+
+class SearchCache:
+    """
+    Memoizes HTS code search results for the session.
+
+    Like TariffCache, results are copied on the way in and out.
+    """
+
+    def __init__(self):
+        self._results: Dict[Tuple[str, Optional[int]], list] = {}
+
+    @staticmethod
+    def make_key(product_description: str, limit: Optional[int]) -> Tuple[str, Optional[int]]:
+        """Build a cache key from search_hts_code arguments."""
+        return (" ".join(product_description.lower().split()), limit)
+
+    def get(self, key: Tuple[str, Optional[int]]) -> Optional[list]:
+        """Return the cached results for key, or None if missing."""
+        return copy.deepcopy(self._results.get(key))
+
+    def remember(self, key: Tuple[str, Optional[int]], results: list):
+        """Store search results under key unless there are none."""
+        # An empty list may only mean the results did not render in time
+        if results:
+            self._results[key] = copy.deepcopy(results)
 
 
 class FlexportTariffClient:
@@ -25,19 +663,60 @@ class FlexportTariffClient:
 
     BASE_URL = "https://tariffs.flexport.com"
 
-    def __init__(self, headless: bool = True, timeout: int = 30000):
+    def __init__(
+        self,
+        headless: bool = True,
+        timeout: int = 30000,
+        use_api: bool = False,
+        api_endpoint: Optional[str] = None,
+        cache_path: Optional[str] = None,
+        block_resources: bool = True,
+        cdp_url: Optional[str] = None,
+        storage_state_path: Optional[str] = None,
+        debug: bool = False
+    ):
         """
         Initialize the Flexport Tariff Client.
 
         Args:
             headless: Whether to run the browser in headless mode
             timeout: Page timeout in milliseconds (default: 30 seconds)
+            use_api: Call the tariff endpoint over HTTP instead of driving a browser
+            api_endpoint: Tariff endpoint URL (defaults to the one saved in
+                page_inspection.json by inspect_page.py)
+            cache_path: File to persist calculation results to between runs
+                (results are always cached in memory for the session)
+            block_resources: Skip loading images, fonts, media, stylesheets
+                and analytics requests
+            cdp_url: DevTools endpoint of a running Chrome to attach to instead
+                of launching one (defaults to the FLEXPORT_CDP_URL env var)
+            storage_state_path: File to load cookies and local storage from
+                at start-up and save them to on close
+            debug: Include the full page HTML as raw_html in scraped results
         """
         self.headless = headless
         self.timeout = timeout
+        self.block_resources = block_resources
+        self.cdp_url = cdp_url or os.environ.get("FLEXPORT_CDP_URL")
+        self.storage_state_path = storage_state_path
+        self.debug = debug
+        self.use_api = use_api
+        self.api_endpoint = api_endpoint
         self.playwright: Optional[Playwright] = None
         self.browser: Optional[Browser] = None
-        self.page: Optional[Page] = None
+        # Sync API objects belong to the thread that called start(), so
+        # calls are serialized on one page; AsyncFlexportTariffClient pools
+        # contexts for concurrent calls
+        self._entry: Optional[PooledPage] = None
+        self._page: Optional[Page] = None
+        # Only set when the client created its own context
+        self._context: Optional[BrowserContext] = None
+        self._shared_context: Optional[BrowserContext] = None
+        self._http: Optional[httpx.Client] = None
+        self._is_tariff_response = tariff_response_matcher(None)
+        self._request_template: Any = None
+        self._cache = TariffCache(cache_path)
+        self._search_cache = SearchCache()
 
     def __enter__(self):
         """Context manager entry."""
@@ -49,21 +728,90 @@ class FlexportTariffClient:
         self.close()
 
     def start(self):
-        """Start the browser session."""
+        """Start the browser session, or the HTTP session in API mode."""
+        recorded = load_tariff_endpoint()
+        if recorded and not self.api_endpoint:
+            self.api_endpoint = recorded.get("url")
+
+        if self.use_api:
+            if not self.api_endpoint:
+                raise RuntimeError(
+                    "No tariff endpoint known. Run inspect_page.py and submit a "
+                    "calculation, or pass api_endpoint explicitly."
+                )
+            # Reuse the body shape and headers (e.g. auth or CSRF tokens) the
+            # site itself sent to this endpoint
+            headers = {}
+            if recorded and recorded.get("url") == self.api_endpoint:
+                self._request_template = recorded.get("post_body")
+                headers = replay_headers(recorded.get("headers"))
+            self._http = httpx.Client(http2=True, headers=headers, timeout=self.timeout / 1000)
+            return
+
+        # Match the calculation XHR on the recorded endpoint when known
+        self._is_tariff_response = tariff_response_matcher(
+            urlsplit(self.api_endpoint).path if self.api_endpoint else None
+        )
+
         self.playwright = sync_playwright().start()
-        self.browser = self.playwright.chromium.launch(headless=self.headless)
-        self.page = self.browser.new_page()
-        self.page.set_default_timeout(self.timeout)
+        if self.cdp_url:
+            # Attach to a long-running Chrome and reuse its default context,
+            # keeping its cookies, HTTP cache and open connections warm
+            self.browser = self.playwright.chromium.connect_over_cdp(self.cdp_url)
+            if self.browser.contexts:
+                self._shared_context = self.browser.contexts[0]
+        else:
+            self.browser = self.playwright.chromium.launch(headless=self.headless, args=LAUNCH_ARGS)
+        self._entry = self._new_page()
 
     def close(self):
         """Close the browser session."""
-        if self.page:
-            self.page.close()
+        self._cache.close()
+        if self._http:
+            self._http.close()
+        # Persist cookies and local storage so the next run skips the
+        # site's cold-start bootstrap
+        if self.storage_state_path and self._context:
+            self._context.storage_state(path=self.storage_state_path)
+        if self._page:
+            self._page.close()
+        # Only close a context this client created; a shared CDP context
+        # belongs to the external browser
+        if self._context:
+            self._context.close()
+        self._page = None
+        self._context = None
+        self._shared_context = None
+        self._entry = None
         if self.browser:
+            # For a CDP connection this disconnects without killing Chrome
             self.browser.close()
         if self.playwright:
             self.playwright.stop()
 
+    def _route_requests(self, target: Union[BrowserContext, Page]):
+        """Install resource blocking on a context or a single page."""
+        if self.block_resources:
+            target.route("**/*", block_unneeded_resources)
+
+    def _new_page(self) -> PooledPage:
+        """Open the client's page, in a fresh context unless one is shared."""
+        context = self._shared_context
+        if context is None:
+            context = self.browser.new_context(storage_state=saved_storage_state(self.storage_state_path))
+            self._route_requests(context)
+            self._context = context
+        page = context.new_page()
+        if self._shared_context is not None:
+            # Routing the shared context would intercept every tab in the
+            # external browser, so only the client's own pages are routed
+            self._route_requests(page)
+        page.set_default_timeout(self.timeout)
+        # Load the SPA up front so the first call fills the form straight away
+        page.goto(self.BASE_URL, wait_until="domcontentloaded")
+        self._page = page
+        return PooledPage(page, SELECTORS)
+
     def calculate_tariff(
         self,
         hts_code: str,
@@ -72,7 +820,7 @@ class FlexportTariffClient:
         entry_date: Optional[str] = None,
         quantity: Optional[float] = None,
         unit: Optional[str] = None
-    ) -> Dict[str, Any]:
+    ) -> TariffResult:
         """
         Calculate tariff for a given HTS code and parameters.
 
@@ -85,197 +833,594 @@ class FlexportTariffClient:
             unit: Unit of measure (optional, depends on HTS code)
 
         Returns:
-            Dictionary containing tariff calculation results including:
+            TariffResult with the tariff calculation results, including:
             - duty_rate: The duty rate percentage
             - duty_amount: The calculated duty amount in USD
             - total_landed_cost: Total cost including duties
             - applicable_tariffs: List of applicable tariff sections
             - hts_description: Description of the HTS code
         """
-        if not self.page:
+        if self._entry is None and not self._http:
             raise RuntimeError("Browser not started. Call start() first or use context manager.")
 
         # Set default entry date to today if not provided
-        if not entry_date:
-            entry_date = datetime.now().strftime("%Y-%m-%d")
+        entry_date = entry_date or today()
 
-        # Navigate to the calculator
-        self.page.goto(self.BASE_URL)
+        cache_key = TariffCache.make_key(
+            hts_code, country_of_origin, shipment_value, entry_date, quantity, unit
+        )
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
 
-        # Wait for the page to load
-        self.page.wait_for_load_state("networkidle")
+        if self._http:
+            results = self._calculate_via_api(
+                hts_code, country_of_origin, shipment_value, entry_date, quantity, unit
+            )
+        else:
+            results = self._calculate_on_page(
+                self._entry, hts_code, country_of_origin, shipment_value, entry_date
+            )
+
+        self._cache.remember(cache_key, results)
+        return results
+
+    def _calculate_on_page(
+        self,
+        entry: PooledPage,
+        hts_code: str,
+        country_of_origin: str,
+        shipment_value: float,
+        entry_date: str
+    ) -> TariffResult:
+        """Fill in and submit the calculator form on the given page."""
+        page = entry.page
+
+        # Pages already sit on the calculator and fill() replaces the
+        # previous call's values; only pages whose last output was read
+        # from the DOM are reloaded (see PooledPage)
+        if entry.needs_reload(self.BASE_URL):
+            page.goto(self.BASE_URL, wait_until="domcontentloaded")
+            entry.mark_loaded()
 
         # Input HTS code
-        # Note: The actual selector will need to be updated based on the website's structure
+        # Note: The selectors live in SELECTORS and may need updating for the website's structure
         try:
-            # Try to find the HTS code input field
-            hts_input = self.page.wait_for_selector(
-                'input[placeholder*="HTS"], input[name*="hts"], input[id*="hts"]',
-                timeout=5000
-            )
-            if hts_input:
-                hts_input.fill(hts_code)
+            entry.hts_input.fill(hts_code, timeout=FIELD_TIMEOUT)
         except Exception as e:
             # If we can't find it automatically, we may need to inspect the page
             raise Exception(f"Could not find HTS code input field. Error: {e}")
 
         # Select country of origin
         try:
-            country_selector = self.page.wait_for_selector(
-                'select[name*="country"], select[id*="country"], input[placeholder*="country"]',
-                timeout=5000
-            )
-            if country_selector:
-                # Check if it's a select dropdown or an autocomplete input
-                if country_selector.evaluate("el => el.tagName") == "SELECT":
-                    country_selector.select_option(label=country_of_origin)
-                else:
-                    country_selector.fill(country_of_origin)
-                    # Wait for autocomplete and select
-                    time.sleep(0.5)
-                    self.page.keyboard.press("ArrowDown")
-                    self.page.keyboard.press("Enter")
+            # Check if it's a select dropdown or an autocomplete input
+            if entry.country_input.evaluate("el => el.tagName", timeout=FIELD_TIMEOUT) == "SELECT":
+                entry.country_input.select_option(label=country_of_origin, **FAST_FILL)
+            else:
+                entry.country_input.fill(country_of_origin, **FAST_FILL)
+                # Click the best matching suggestion as soon as they render
+                entry.country_options.first.wait_for(timeout=OPTION_TIMEOUT)
+                for option in entry.country_option_choices(country_of_origin):
+                    if option.count():
+                        option.first.click(timeout=OPTION_TIMEOUT)
+                        break
         except Exception as e:
             raise Exception(f"Could not find country selector. Error: {e}")
 
         # Input shipment value
         try:
-            value_input = self.page.wait_for_selector(
-                'input[placeholder*="value"], input[name*="value"], input[type="number"]',
-                timeout=5000
-            )
-            if value_input:
-                value_input.fill(str(shipment_value))
+            entry.value_input.fill(str(shipment_value), timeout=FIELD_TIMEOUT, **FAST_FILL)
         except Exception as e:
             raise Exception(f"Could not find shipment value input. Error: {e}")
 
         # Input entry date if field exists
         try:
-            date_input = self.page.query_selector(
-                'input[type="date"], input[placeholder*="date"], input[name*="date"]'
-            )
-            if date_input:
-                date_input.fill(entry_date)
+            if entry.date_input.count():
+                entry.date_input.first.fill(entry_date, **FAST_FILL)
         except Exception:
             # Date field might not always be present
             pass
 
         # Click calculate button
         try:
-            calculate_button = self.page.wait_for_selector(
-                'button:has-text("Calculate"), button[type="submit"], input[type="submit"]',
-                timeout=5000
-            )
-            if calculate_button:
-                calculate_button.click()
+            entry.calculate_button.wait_for(timeout=FIELD_TIMEOUT)
         except Exception as e:
             raise Exception(f"Could not find calculate button. Error: {e}")
 
-        # Wait for results
-        self.page.wait_for_load_state("networkidle")
-        time.sleep(2)  # Additional wait for dynamic content
+        # Snapshot results an earlier calculation left on the page, so a
+        # DOM fallback below can tell them apart from this call's
+        before = page.evaluate(EXTRACT_RESULTS_JS, result_selectors()) if entry.shows_calculation else None
+
+        # Wait for the XHR that carries the tariff data instead of sleeping;
+        # until it is read the page counts as showing DOM-only output
+        entry.has_results = True
+        results = None
+        try:
+            with page.expect_response(self._is_tariff_response, timeout=RESPONSE_TIMEOUT) as response_info:
+                entry.calculate_button.click()
+            # Prefer the JSON payload; fall back to scraping the rendered page
+            results = parse_tariff_body(response_info.value.body())
+        except PlaywrightTimeoutError:
+            # The site's endpoint did not match is_tariff_response (e.g. no
+            # endpoint recorded yet); read the rendered results instead
+            pass
+        except Exception as e:
+            raise Exception(f"Could not submit the tariff calculation. Error: {e}")
 
-        # Extract results
-        # Note: These selectors will need to be updated based on the actual page structure
-        results = self._extract_results()
+        if results is not None:
+            entry.mark_payload_read()
+        else:
+            try:
+                if before is None:
+                    page.wait_for_selector(
+                        f'{SELECTORS["duty_rate"]}, {SELECTORS["total_landed_cost"]}',
+                        state="visible",
+                        timeout=FIELD_TIMEOUT
+                    )
+                else:
+                    page.wait_for_function(
+                        RESULTS_CHANGED_JS, arg=[result_selectors(), before], timeout=FIELD_TIMEOUT
+                    )
+            except PlaywrightTimeoutError:
+                # Identical results never change; read what is shown
+                pass
+            results = self._extract_results(page)
 
         return results
 
-    def _extract_results(self) -> Dict[str, Any]:
+    def _calculate_via_api(
+        self,
+        hts_code: str,
+        country_of_origin: str,
+        shipment_value: float,
+        entry_date: str,
+        quantity: Optional[float],
+        unit: Optional[str]
+    ) -> TariffResult:
         """
-        Extract tariff calculation results from the page.
+        Calculate tariff by posting directly to the discovered endpoint.
 
         Returns:
-            Dictionary containing the extracted results
+            TariffResult with the tariff calculation results
         """
-        results = {
-            "hts_code": None,
-            "hts_description": None,
-            "country_of_origin": None,
-            "duty_rate": None,
-            "duty_amount": None,
-            "total_landed_cost": None,
-            "applicable_tariffs": [],
-            "raw_html": None
-        }
+        payload = build_tariff_payload(
+            {
+                "hts_code": hts_code,
+                "country_of_origin": country_of_origin,
+                "shipment_value": shipment_value,
+                "entry_date": entry_date,
+                "quantity": quantity,
+                "unit": unit,
+            },
+            self._request_template
+        )
 
-        # Try to extract results from the page
-        # This will need to be customized based on the actual page structure
         try:
-            # Get the entire page content for debugging
-            results["raw_html"] = self.page.content()
+            response = self._http.post(self.api_endpoint, json=payload)
+            response.raise_for_status()
+            results = parse_tariff_payload(response.json())
+        except Exception as e:
+            raise Exception(f"Error calling tariff endpoint {self.api_endpoint}. Error: {e}")
 
-            # Try to find result elements
-            # These are example selectors - they need to be updated based on actual page structure
+        if results is None:
+            raise Exception(f"Unexpected response from tariff endpoint {self.api_endpoint}")
 
-            # Look for duty rate
-            duty_rate_element = self.page.query_selector(
-                '[class*="duty"], [class*="rate"], [id*="duty"]'
-            )
-            if duty_rate_element:
-                results["duty_rate"] = duty_rate_element.inner_text()
+        return results
 
-            # Look for total cost
-            total_element = self.page.query_selector(
-                '[class*="total"], [class*="landed"], [id*="total"]'
-            )
-            if total_element:
-                results["total_landed_cost"] = total_element.inner_text()
+    def _extract_results(self, page: Page) -> TariffResult:
+        """
+        Extract tariff calculation results from the page.
 
-            # Look for HTS description
-            description_element = self.page.query_selector(
-                '[class*="description"], [class*="hts-desc"]'
-            )
-            if description_element:
-                results["hts_description"] = description_element.inner_text()
+        Args:
+            page: Page showing the calculation results
 
-        except Exception as e:
-            results["error"] = f"Error extracting results: {e}"
+        Returns:
+            TariffResult with the extracted results
+        """
+        # Try to extract results from the page
+        # This will need to be customized based on the actual page structure
+        try:
+            # Get the entire page content for debugging; it is large, so
+            # only when asked for
+            raw_html = page.content() if self.debug else None
 
-        return results
+            # Read all result fields in a single round trip
+            # The selectors live in SELECTORS and may need updating for the actual page structure
+            return results_from_dom(page.evaluate(EXTRACT_RESULTS_JS, result_selectors()), raw_html)
 
-    def search_hts_code(self, product_description: str) -> list:
+        except Exception as e:
+            return TariffResult(error=f"Error extracting results: {e}")
+
+    def search_hts_code(self, product_description: str, limit: Optional[int] = None) -> list:
         """
         Search for HTS codes based on a product description.
 
         Args:
             product_description: Plain English description of the product
+            limit: Return at most this many results (all if None)
 
         Returns:
             List of potential HTS codes with descriptions
         """
-        if not self.page:
+        if self._http:
+            raise RuntimeError("HTS code search requires the browser; it is not available with use_api=True.")
+        if self._entry is None:
             raise RuntimeError("Browser not started. Call start() first or use context manager.")
 
-        self.page.goto(self.BASE_URL)
-        self.page.wait_for_load_state("networkidle")
+        search_key = SearchCache.make_key(product_description, limit)
+        cached = self._search_cache.get(search_key)
+        if cached is not None:
+            return cached
+
+        results = self._search_on_page(self._entry, product_description, limit)
+
+        self._search_cache.remember(search_key, results)
+        return results
+
+    def _search_on_page(self, entry: PooledPage, product_description: str, limit: Optional[int]) -> list:
+        """Run an HTS code search on the given page."""
+        page = entry.page
+        if entry.needs_reload(self.BASE_URL):
+            page.goto(self.BASE_URL, wait_until="domcontentloaded")
+            entry.mark_loaded()
 
         # Find search box and enter description
         try:
-            search_input = self.page.wait_for_selector(
-                'input[placeholder*="search"], input[placeholder*="product"]',
-                timeout=5000
+            entry.search_input.fill(product_description, timeout=FIELD_TIMEOUT)
+            entry.search_input.press("Enter")
+            entry.has_results = True
+
+            # Wait for results to be attached rather than sleeping
+            try:
+                entry.search_results.first.wait_for(state="attached", timeout=FIELD_TIMEOUT)
+            except PlaywrightTimeoutError:
+                # No results rendered for this description
+                return []
+
+            # Extract the top results in a single round trip
+            # The selectors live in SELECTORS and may need updating for the actual page structure
+            return page.evaluate(EXTRACT_SEARCH_JS, search_args(limit))
+
+        except Exception as e:
+            raise Exception(f"Error searching for HTS codes: {e}")
+
+
+class AsyncFlexportTariffClient:
+    """
+    Asyncio counterpart of FlexportTariffClient.
+
+    All calls share one Chromium process. A pool of max_concurrency
+    BrowserContexts is opened up front; each calculate_tariff or
+    search_hts_code call borrows one, so many calls can be awaited together
+    with asyncio.gather while the pool bounds how many run at once.
+
+    Everything that does not touch the page (payload parsing, caching, the
+    reload decision) lives in module-level helpers shared with
+    FlexportTariffClient, so the page-driving methods of the two classes
+    differ only in awaiting Playwright calls.
+    """
+
+    BASE_URL = FlexportTariffClient.BASE_URL
+
+    def __init__(
+        self,
+        headless: bool = True,
+        timeout: int = 30000,
+        max_concurrency: int = 5,
+        cache_path: Optional[str] = None,
+        block_resources: bool = True,
+        cdp_url: Optional[str] = None,
+        storage_state_path: Optional[str] = None,
+        debug: bool = False
+    ):
+        """
+        Initialize the async Flexport Tariff Client.
+
+        Args:
+            headless: Whether to run the browser in headless mode
+            timeout: Page timeout in milliseconds (default: 30 seconds)
+            max_concurrency: Number of pooled browser contexts, and so the
+                maximum number of calculations in flight at once
+            cache_path: File to persist calculation results to between runs
+                (results are always cached in memory for the session)
+            block_resources: Skip loading images, fonts, media, stylesheets
+                and analytics requests
+            cdp_url: DevTools endpoint of a running Chrome to attach to instead
+                of launching one (defaults to the FLEXPORT_CDP_URL env var)
+            storage_state_path: File to load cookies and local storage from
+                at start-up and save them to on close
+            debug: Include the full page HTML as raw_html in scraped results
+        """
+        self.headless = headless
+        self.timeout = timeout
+        self.block_resources = block_resources
+        self.cdp_url = cdp_url or os.environ.get("FLEXPORT_CDP_URL")
+        self.storage_state_path = storage_state_path
+        self.debug = debug
+        self.max_concurrency = max_concurrency
+        self.playwright: Optional[AsyncPlaywright] = None
+        self.browser: Optional[AsyncBrowser] = None
+        self.pool_stats = {"created": 0, "acquired": 0}
+        self._pool: Optional["asyncio.Queue[PooledPage]"] = None
+        self._pages: List[AsyncPage] = []
+        self._contexts: List[AsyncBrowserContext] = []
+        self._shared_context: Optional[AsyncBrowserContext] = None
+        self._is_tariff_response = tariff_response_matcher(None)
+        self._cache = TariffCache(cache_path)
+        self._search_cache = SearchCache()
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.close()
+
+    async def start(self):
+        """Start the browser session."""
+        recorded = load_tariff_endpoint()
+        self._is_tariff_response = tariff_response_matcher(
+            urlsplit(recorded["url"]).path if recorded else None
+        )
+
+        self.playwright = await async_playwright().start()
+        if self.cdp_url:
+            # Attach to a long-running Chrome and reuse its default context
+            self.browser = await self.playwright.chromium.connect_over_cdp(self.cdp_url)
+            if self.browser.contexts:
+                self._shared_context = self.browser.contexts[0]
+        else:
+            self.browser = await self.playwright.chromium.launch(headless=self.headless, args=LAUNCH_ARGS)
+        # Created here so the queue binds to the running event loop
+        self._pool = asyncio.Queue()
+        entries = await asyncio.gather(*[self._new_page() for _ in range(self.max_concurrency)])
+        for entry in entries:
+            self._pool.put_nowait(entry)
+
+    async def close(self):
+        """Close the browser session."""
+        self._cache.close()
+        # Persist cookies and local storage for the next run
+        if self.storage_state_path and self._contexts:
+            await self._contexts[0].storage_state(path=self.storage_state_path)
+        for page in self._pages:
+            await page.close()
+        # Only close contexts this client created
+        for context in self._contexts:
+            await context.close()
+        self._pages = []
+        self._contexts = []
+        self._shared_context = None
+        self._pool = None
+        if self.browser:
+            await self.browser.close()
+        if self.playwright:
+            await self.playwright.stop()
+
+    async def _route_requests(self, target: Union[AsyncBrowserContext, AsyncPage]):
+        """Install resource blocking on a context or a single page."""
+        if self.block_resources:
+            await target.route("**/*", block_unneeded_resources_async)
+
+    async def _new_page(self) -> PooledPage:
+        """Open a page for the pool, in a fresh context unless one is shared."""
+        context = self._shared_context
+        if context is None:
+            context = await self.browser.new_context(storage_state=saved_storage_state(self.storage_state_path))
+            await self._route_requests(context)
+            self._contexts.append(context)
+        page = await context.new_page()
+        if self._shared_context is not None:
+            # Route only the client's own pages, never the external browser's tabs
+            await self._route_requests(page)
+        page.set_default_timeout(self.timeout)
+        # Load the SPA up front so the first call fills the form straight away
+        await page.goto(self.BASE_URL, wait_until="domcontentloaded")
+        self._pages.append(page)
+        self.pool_stats["created"] += 1
+        return PooledPage(page, SELECTORS)
+
+    async def acquire(self) -> PooledPage:
+        """Borrow a page from the pool, waiting until one is free."""
+        entry = await self._pool.get()
+        self.pool_stats["acquired"] += 1
+        return entry
+
+    async def release(self, entry: PooledPage):
+        """Return a page obtained from acquire() to the pool."""
+        self._pool.put_nowait(entry)
+
+    async def calculate_tariff(
+        self,
+        hts_code: str,
+        country_of_origin: str,
+        shipment_value: float,
+        entry_date: Optional[str] = None,
+        quantity: Optional[float] = None,
+        unit: Optional[str] = None
+    ) -> TariffResult:
+        """
+        Calculate tariff for a given HTS code and parameters.
+
+        Takes the same arguments and returns the same TariffResult as
+        FlexportTariffClient.calculate_tariff.
+        """
+        if self._pool is None:
+            raise RuntimeError("Browser not started. Call start() first or use async context manager.")
+
+        # Set default entry date to today if not provided
+        entry_date = entry_date or today()
+
+        cache_key = TariffCache.make_key(
+            hts_code, country_of_origin, shipment_value, entry_date, quantity, unit
+        )
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        entry = await self.acquire()
+        try:
+            results = await self._calculate_on_page(
+                entry, hts_code, country_of_origin, shipment_value, entry_date
             )
-            if search_input:
-                search_input.fill(product_description)
-                self.page.keyboard.press("Enter")
+        finally:
+            await self.release(entry)
+
+        self._cache.remember(cache_key, results)
+        return results
+
+    async def _calculate_on_page(
+        self,
+        entry: PooledPage,
+        hts_code: str,
+        country_of_origin: str,
+        shipment_value: float,
+        entry_date: str
+    ) -> TariffResult:
+        """Fill in and submit the calculator form on the given page."""
+        page = entry.page
+
+        # Reload pages still showing a previous call's results
+        if entry.needs_reload(self.BASE_URL):
+            await page.goto(self.BASE_URL, wait_until="domcontentloaded")
+            entry.mark_loaded()
+
+        # Input HTS code
+        try:
+            await entry.hts_input.fill(hts_code, timeout=FIELD_TIMEOUT)
+        except Exception as e:
+            raise Exception(f"Could not find HTS code input field. Error: {e}")
+
+        # Select country of origin
+        try:
+            if await entry.country_input.evaluate("el => el.tagName", timeout=FIELD_TIMEOUT) == "SELECT":
+                await entry.country_input.select_option(label=country_of_origin, **FAST_FILL)
+            else:
+                await entry.country_input.fill(country_of_origin, **FAST_FILL)
+                # Click the best matching suggestion as soon as they render
+                await entry.country_options.first.wait_for(timeout=OPTION_TIMEOUT)
+                for option in entry.country_option_choices(country_of_origin):
+                    if await option.count():
+                        await option.first.click(timeout=OPTION_TIMEOUT)
+                        break
+        except Exception as e:
+            raise Exception(f"Could not find country selector. Error: {e}")
+
+        # Input shipment value
+        try:
+            await entry.value_input.fill(str(shipment_value), timeout=FIELD_TIMEOUT, **FAST_FILL)
+        except Exception as e:
+            raise Exception(f"Could not find shipment value input. Error: {e}")
 
-            # Wait for results
-            self.page.wait_for_load_state("networkidle")
-            time.sleep(1)
+        # Input entry date if field exists
+        try:
+            if await entry.date_input.count():
+                await entry.date_input.first.fill(entry_date, **FAST_FILL)
+        except Exception:
+            # Date field might not always be present
+            pass
+
+        # Click calculate button
+        try:
+            await entry.calculate_button.wait_for(timeout=FIELD_TIMEOUT)
+        except Exception as e:
+            raise Exception(f"Could not find calculate button. Error: {e}")
+
+        # Snapshot results an earlier calculation left on the page
+        before = await page.evaluate(EXTRACT_RESULTS_JS, result_selectors()) if entry.shows_calculation else None
+
+        # Wait for the XHR that carries the tariff data instead of sleeping
+        entry.has_results = True
+        results = None
+        try:
+            async with page.expect_response(self._is_tariff_response, timeout=RESPONSE_TIMEOUT) as response_info:
+                await entry.calculate_button.click()
+            # Prefer the JSON payload; fall back to scraping the rendered page
+            results = parse_tariff_body(await (await response_info.value).body())
+        except AsyncPlaywrightTimeoutError:
+            # No matching XHR; read the rendered results instead
+            pass
+        except Exception as e:
+            raise Exception(f"Could not submit the tariff calculation. Error: {e}")
+
+        if results is not None:
+            entry.mark_payload_read()
+        else:
+            try:
+                if before is None:
+                    await page.wait_for_selector(
+                        f'{SELECTORS["duty_rate"]}, {SELECTORS["total_landed_cost"]}',
+                        state="visible",
+                        timeout=FIELD_TIMEOUT
+                    )
+                else:
+                    await page.wait_for_function(
+                        RESULTS_CHANGED_JS, arg=[result_selectors(), before], timeout=FIELD_TIMEOUT
+                    )
+            except AsyncPlaywrightTimeoutError:
+                pass
+            results = await self._extract_results(page)
+
+        return results
 
-            # Extract search results
-            results = []
-            # This selector needs to be updated based on actual page structure
-            result_elements = self.page.query_selector_all('[class*="search-result"], [class*="hts-result"]')
+    async def _extract_results(self, page: AsyncPage) -> TariffResult:
+        """
+        Extract tariff calculation results from the page.
+
+        Returns:
+            TariffResult with the extracted results
+        """
+        try:
+            raw_html = await page.content() if self.debug else None
+            return results_from_dom(await page.evaluate(EXTRACT_RESULTS_JS, result_selectors()), raw_html)
+        except Exception as e:
+            return TariffResult(error=f"Error extracting results: {e}")
+
+    async def search_hts_code(self, product_description: str, limit: Optional[int] = None) -> list:
+        """
+        Search for HTS codes based on a product description.
+
+        Takes the same arguments and returns the same list as
+        FlexportTariffClient.search_hts_code.
+        """
+        if self._pool is None:
+            raise RuntimeError("Browser not started. Call start() first or use async context manager.")
+
+        search_key = SearchCache.make_key(product_description, limit)
+        cached = self._search_cache.get(search_key)
+        if cached is not None:
+            return cached
+
+        entry = await self.acquire()
+        try:
+            results = await self._search_on_page(entry, product_description, limit)
+        finally:
+            await self.release(entry)
+
+        self._search_cache.remember(search_key, results)
+        return results
+
+    async def _search_on_page(self, entry: PooledPage, product_description: str, limit: Optional[int]) -> list:
+        """Run an HTS code search on the given page."""
+        page = entry.page
+        if entry.needs_reload(self.BASE_URL):
+            await page.goto(self.BASE_URL, wait_until="domcontentloaded")
+            entry.mark_loaded()
+
+        try:
+            await entry.search_input.fill(product_description, timeout=FIELD_TIMEOUT)
+            await entry.search_input.press("Enter")
+            entry.has_results = True
 
-            for element in result_elements:
-                results.append({
-                    "hts_code": element.query_selector('[class*="code"]').inner_text() if element.query_selector('[class*="code"]') else None,
-                    "description": element.inner_text()
-                })
+            try:
+                await entry.search_results.first.wait_for(state="attached", timeout=FIELD_TIMEOUT)
+            except AsyncPlaywrightTimeoutError:
+                # No results rendered for this description
+                return []
 
-            return results
+            return await page.evaluate(EXTRACT_SEARCH_JS, search_args(limit))
 
         except Exception as e:
             raise Exception(f"Error searching for HTS codes: {e}")
@@ -294,7 +1439,7 @@ def main():
         )
 
         print("Tariff Calculation Results:")
-        print(json.dumps(result, indent=2))
+        print(orjson.dumps(result, option=orjson.OPT_INDENT_2).decode())
 
 
 if __name__ == "__main__":
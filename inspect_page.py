@@ -7,9 +7,194 @@ API endpoints used by the site.
 """
 
 import json
+import re
+import sys
+from urllib.parse import urlsplit
+import orjson
 from playwright.sync_api import sync_playwright
 
 
+# Generated module read by flexport_tariff_client.py
+SELECTORS_MODULE = 'tariff_selectors.py'
+
+# Playwright trace of the whole inspection (open with `playwright show-trace`)
+TRACE_PATH = 'inspection_trace.zip'
+
+# Resource types of requests issued by the page's scripts
+XHR_RESOURCE_TYPES = ('xhr', 'fetch')
+
+# URL paths (or GraphQL operations) that look like the tariff calculation
+TARIFF_PATH_PATTERN = re.compile(r'calculat|tariff|dut(y|ies)', re.IGNORECASE)
+
+# Ids that UI frameworks generate per render (mui-12, :r3:, headlessui-input-5)
+GENERATED_ID_PATTERN = re.compile(r'^mui-\d+$|^:r\w+:$|-\d+$')
+
+# How long to keep the page open for late requests when not interactive (ms)
+NON_INTERACTIVE_WAIT = 5000
+
+
+def is_api_url(url: str) -> bool:
+    """Return True if the URL looks like an internal API endpoint."""
+    url = url.lower()
+    return 'api' in url or 'graphql' in url
+
+
+def names_tariff_operation(post_body) -> bool:
+    """Return True if a GraphQL request body names a tariff operation."""
+    operations = post_body if isinstance(post_body, list) else [post_body]
+    for operation in operations:
+        if isinstance(operation, dict):
+            text = f"{operation.get('operationName') or ''} {operation.get('query') or ''}"
+            if TARIFF_PATH_PATTERN.search(text):
+                return True
+    return False
+
+
+def find_tariff_endpoint(api_requests: list):
+    """
+    Pick the request that submits a tariff calculation.
+
+    Only POST requests made by the page's scripts are considered. The path
+    is matched rather than the whole URL, since the hostname itself
+    contains "tariff"; for GraphQL endpoints the operation in the body is
+    matched instead.
+
+    Returns:
+        Dictionary with the endpoint URL, method, headers and POST body,
+        or None
+    """
+    for request in api_requests:
+        if request['method'] != 'POST' or request.get('resource_type') not in XHR_RESOURCE_TYPES:
+            continue
+        post_data = request['post_data']
+        try:
+            post_data = json.loads(post_data) if post_data else None
+        except ValueError:
+            pass
+        path = urlsplit(request['url']).path
+        if TARIFF_PATH_PATTERN.search(path) or ('graphql' in path.lower() and names_tariff_operation(post_data)):
+            return {
+                'url': request['url'],
+                'method': request['method'],
+                'headers': request['headers'],
+                'post_body': post_data
+            }
+    return None
+
+
+def css_string(value: str) -> str:
+    """
+    Quote a value as a CSS string.
+
+    json.dumps escapes quotes and backslashes the way CSS does; with
+    ensure_ascii=False it leaves non-ASCII text as is rather than writing
+    \\uXXXX, which CSS would not decode.
+    """
+    return json.dumps(value, ensure_ascii=False)
+
+
+def css_selector(tag: str, info: dict):
+    """
+    Build the most specific stable selector for an element descriptor.
+
+    Prefers id, then name, then placeholder. Ids that look framework
+    generated change between renders, so they are only used when the
+    element has no name or placeholder. Returns None if the element
+    carries none of them.
+    """
+    element_id = info.get('id')
+    if element_id and not GENERATED_ID_PATTERN.search(element_id):
+        return id_selector(tag, element_id)
+    for attribute in ('name', 'placeholder'):
+        if info.get(attribute):
+            return f'{tag}[{attribute}={css_string(info[attribute])}]'
+    if element_id:
+        return id_selector(tag, element_id)
+    return None
+
+
+def id_selector(tag: str, element_id: str) -> str:
+    """Return #id, or an attribute selector if the id is not a valid CSS identifier."""
+    if re.fullmatch(r'[A-Za-z][\w-]*', element_id):
+        return f'#{element_id}'
+    return f'{tag}[id={css_string(element_id)}]'
+
+
+def find_element(descriptors: list, keywords: tuple, types: tuple = ()):
+    """
+    Return the first descriptor whose name, id or placeholder contains a keyword.
+
+    Falls back to the first descriptor whose type is in types only when no
+    descriptor matches a keyword, since a type such as "number" is shared
+    by many fields.
+    """
+    for info in descriptors:
+        text = ' '.join(str(info.get(key) or '') for key in ('name', 'id', 'placeholder')).lower()
+        if any(keyword in text for keyword in keywords):
+            return info
+    for info in descriptors:
+        if info.get('type') in types:
+            return info
+    return None
+
+
+def build_selectors(input_info: list, select_info: list, button_info: list) -> dict:
+    """
+    Derive exact form selectors from the inspected inputs, selects and buttons.
+
+    Returns:
+        Dictionary keyed like DEFAULT_SELECTORS in flexport_tariff_client.py,
+        containing only the fields that could be identified
+    """
+    selectors = {}
+    candidates = {
+        'hts_input': ('input', find_element(input_info, ('hts',))),
+        'value_input': ('input', find_element(input_info, ('value',), ('number',))),
+        'date_input': ('input', find_element(input_info, ('date',), ('date',))),
+        'search_input': ('input', find_element(input_info, ('search', 'product'))),
+    }
+    country_select = find_element(select_info, ('country', 'origin'))
+    if country_select:
+        candidates['country_input'] = ('select', country_select)
+    else:
+        candidates['country_input'] = ('input', find_element(input_info, ('country', 'origin')))
+
+    for key, (tag, info) in candidates.items():
+        selector = css_selector(tag, info) if info else None
+        if selector:
+            selectors[key] = selector
+
+    for info in button_info:
+        if 'calculate' in (info.get('text') or '').lower():
+            selectors['calculate_button'] = (
+                css_selector('button', info) or f'button:has-text({css_string(info["text"].strip())})'
+            )
+            break
+
+    return selectors
+
+
+def write_selectors_module(selectors: dict, timestamp: str, path: str = SELECTORS_MODULE):
+    """Write the selectors as Python constants the client imports at start-up."""
+    lines = [
+        '"""',
+        f'Selectors for tariffs.flexport.com, generated by inspect_page.py on {timestamp}.',
+        '',
+        'Re-run inspect_page.py to regenerate; manual edits will be overwritten.',
+        '"""',
+        '',
+    ]
+    for key, selector in selectors.items():
+        lines.append(f'{key.upper()} = {selector!r}')
+    lines += ['', 'SELECTORS = {']
+    for key in selectors:
+        lines.append(f'    {key!r}: {key.upper()},')
+    lines.append('}')
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+
+
 def inspect_tariff_page():
     """
     Inspect the tariffs.flexport.com page structure.
@@ -19,132 +204,164 @@ def inspect_tariff_page():
     2. Captures network requests to find API endpoints
     3. Analyzes the page structure
     4. Saves findings to a JSON file
+    5. Generates tariff_selectors.py with exact form selectors
+    6. Records a Playwright trace of the session
+
+    When stdin is not a terminal (e.g. in CI) it waits briefly for late
+    requests instead of prompting, so it never blocks.
     """
 
+    interactive = sys.stdin.isatty()
+
     with sync_playwright() as p:
-        # Launch browser in non-headless mode so we can see what's happening
-        browser = p.chromium.launch(headless=False)
-        page = browser.new_page()
-
-        # Store network requests
-        api_requests = []
-        api_responses = []
-
-        def handle_request(request):
-            """Capture all network requests."""
-            if 'api' in request.url.lower() or 'graphql' in request.url.lower():
-                api_requests.append({
-                    'url': request.url,
-                    'method': request.method,
-                    'headers': dict(request.headers),
-                    'post_data': request.post_data
-                })
-                print(f"[REQUEST] {request.method} {request.url}")
-
-        def handle_response(response):
-            """Capture API responses."""
-            if 'api' in response.url.lower() or 'graphql' in response.url.lower():
-                try:
-                    api_responses.append({
-                        'url': response.url,
-                        'status': response.status,
-                        'headers': dict(response.headers)
+        # Launch browser in non-headless mode so we can see what's happening;
+        # without a terminal there is no one watching (and often no display)
+        browser = p.chromium.launch(headless=not interactive)
+        context = browser.new_context()
+        # Record screenshots and DOM snapshots so the run can be reviewed
+        # later without re-running the inspector
+        context.tracing.start(screenshots=True, snapshots=True)
+        try:
+            page = context.new_page()
+
+            # Store network requests
+            api_requests = []
+            api_responses = []
+
+            def handle_request(request):
+                """Capture all network requests."""
+                if is_api_url(request.url):
+                    api_requests.append({
+                        'url': request.url,
+                        'method': request.method,
+                        'resource_type': request.resource_type,
+                        'headers': dict(request.headers),
+                        'post_data': request.post_data
                     })
-                    print(f"[RESPONSE] {response.status} {response.url}")
-                except Exception as e:
-                    print(f"Error capturing response: {e}")
-
-        # Set up network monitoring
-        page.on("request", handle_request)
-        page.on("response", handle_response)
-
-        # Navigate to the page
-        print("Navigating to tariffs.flexport.com...")
-        page.goto("https://tariffs.flexport.com")
-        page.wait_for_load_state("networkidle")
-
-        # Analyze page structure
-        print("\n=== Analyzing page structure ===\n")
-
-        # Find all input fields
-        inputs = page.query_selector_all("input")
-        print(f"Found {len(inputs)} input fields:")
-        input_info = []
-        for i, inp in enumerate(inputs):
-            info = {
-                'index': i,
-                'type': inp.get_attribute('type'),
-                'name': inp.get_attribute('name'),
-                'id': inp.get_attribute('id'),
-                'placeholder': inp.get_attribute('placeholder'),
-                'class': inp.get_attribute('class')
-            }
-            input_info.append(info)
-            print(f"  Input {i}: {info}")
-
-        # Find all select dropdowns
-        selects = page.query_selector_all("select")
-        print(f"\nFound {len(selects)} select dropdowns:")
-        select_info = []
-        for i, sel in enumerate(selects):
-            info = {
-                'index': i,
-                'name': sel.get_attribute('name'),
-                'id': sel.get_attribute('id'),
-                'class': sel.get_attribute('class')
-            }
-            select_info.append(info)
-            print(f"  Select {i}: {info}")
-
-        # Find all buttons
-        buttons = page.query_selector_all("button")
-        print(f"\nFound {len(buttons)} buttons:")
-        button_info = []
-        for i, btn in enumerate(buttons):
-            info = {
-                'index': i,
-                'type': btn.get_attribute('type'),
-                'text': btn.inner_text()[:50] if btn.inner_text() else None,
-                'class': btn.get_attribute('class')
+                    print(f"[REQUEST] {request.method} {request.url}")
+
+            def handle_response(response):
+                """Capture API responses."""
+                if is_api_url(response.url):
+                    try:
+                        api_responses.append({
+                            'url': response.url,
+                            'status': response.status,
+                            'headers': dict(response.headers)
+                        })
+                        print(f"[RESPONSE] {response.status} {response.url}")
+                    except Exception as e:
+                        print(f"Error capturing response: {e}")
+
+            # Set up network monitoring
+            page.on("request", handle_request)
+            page.on("response", handle_response)
+
+            # Navigate to the page
+            print("Navigating to tariffs.flexport.com...")
+            page.goto("https://tariffs.flexport.com")
+            page.wait_for_load_state("networkidle")
+
+            # Analyze page structure
+            print("\n=== Analyzing page structure ===\n")
+
+            # Find all input fields
+            # One evaluate per element type replaces a get_attribute round trip
+            # per attribute per element
+            input_info = page.evaluate("""() => Array.from(document.querySelectorAll('input')).map((el, i) => ({
+                index: i,
+                type: el.getAttribute('type'),
+                name: el.getAttribute('name'),
+                id: el.getAttribute('id'),
+                placeholder: el.getAttribute('placeholder'),
+                class: el.getAttribute('class')
+            }))""")
+            print(f"Found {len(input_info)} input fields:")
+            for info in input_info:
+                print(f"  Input {info['index']}: {info}")
+
+            # Find all select dropdowns
+            select_info = page.evaluate("""() => Array.from(document.querySelectorAll('select')).map((el, i) => ({
+                index: i,
+                name: el.getAttribute('name'),
+                id: el.getAttribute('id'),
+                class: el.getAttribute('class')
+            }))""")
+            print(f"\nFound {len(select_info)} select dropdowns:")
+            for info in select_info:
+                print(f"  Select {info['index']}: {info}")
+
+            # Find all buttons
+            button_info = page.evaluate("""() => Array.from(document.querySelectorAll('button')).map((el, i) => ({
+                index: i,
+                type: el.getAttribute('type'),
+                id: el.getAttribute('id'),
+                name: el.getAttribute('name'),
+                text: el.innerText ? el.innerText.slice(0, 50) : null,
+                class: el.getAttribute('class')
+            }))""")
+            print(f"\nFound {len(button_info)} buttons:")
+            for info in button_info:
+                print(f"  Button {info['index']}: {info}")
+
+            # Check for React or Vue components
+            print("\n=== Checking for JavaScript frameworks ===")
+            has_react = page.evaluate("() => !!window.React || !!document.querySelector('[data-reactroot]')")
+            has_vue = page.evaluate("() => !!window.Vue || !!document.querySelector('[data-v-]')")
+            print(f"React detected: {has_react}")
+            print(f"Vue detected: {has_vue}")
+
+            # Save all findings
+            findings = {
+                'url': 'https://tariffs.flexport.com',
+                'timestamp': page.evaluate('() => new Date().toISOString()'),
+                'page_title': page.title(),
+                'inputs': input_info,
+                'selects': select_info,
+                'buttons': button_info,
+                'api_requests': api_requests,
+                'api_responses': api_responses,
+                'has_react': has_react,
+                'has_vue': has_vue,
+                'tariff_endpoint': find_tariff_endpoint(api_requests)
             }
-            button_info.append(info)
-            print(f"  Button {i}: {info}")
-
-        # Check for React or Vue components
-        print("\n=== Checking for JavaScript frameworks ===")
-        has_react = page.evaluate("() => !!window.React || !!document.querySelector('[data-reactroot]')")
-        has_vue = page.evaluate("() => !!window.Vue || !!document.querySelector('[data-v-]')")
-        print(f"React detected: {has_react}")
-        print(f"Vue detected: {has_vue}")
-
-        # Save all findings
-        findings = {
-            'url': 'https://tariffs.flexport.com',
-            'timestamp': page.evaluate('() => new Date().toISOString()'),
-            'page_title': page.title(),
-            'inputs': input_info,
-            'selects': select_info,
-            'buttons': button_info,
-            'api_requests': api_requests,
-            'api_responses': api_responses,
-            'has_react': has_react,
-            'has_vue': has_vue
-        }
-
-        # Save to file
-        with open('page_inspection.json', 'w') as f:
-            json.dump(findings, indent=2, fp=f)
-
-        print(f"\n=== Inspection complete ===")
-        print(f"Findings saved to page_inspection.json")
-        print(f"Captured {len(api_requests)} API requests")
-        print(f"Captured {len(api_responses)} API responses")
-
-        # Keep browser open for manual inspection
-        print("\nBrowser will stay open for manual inspection.")
-        print("You can now interact with the page to see network requests.")
-        print("Press Enter when done to close the browser...")
-        input()
+
+            # Save to file
+            with open('page_inspection.json', 'wb') as f:
+                f.write(orjson.dumps(findings, option=orjson.OPT_INDENT_2))
+
+            # Generate exact selectors for the client
+            selectors = build_selectors(input_info, select_info, button_info)
+            write_selectors_module(selectors, findings['timestamp'])
+
+            print(f"\n=== Inspection complete ===")
+            print(f"Findings saved to page_inspection.json")
+            print(f"Generated {len(selectors)} selectors in {SELECTORS_MODULE}")
+            print(f"Captured {len(api_requests)} API requests")
+            print(f"Captured {len(api_responses)} API responses")
+
+            if interactive:
+                # Keep browser open for manual inspection
+                print("\nBrowser will stay open for manual inspection.")
+                print("You can now interact with the page to see network requests.")
+                print("Submit a calculation to record the tariff endpoint for use_api=True.")
+                print("Press Enter when done to close the browser...")
+                input()
+            else:
+                # No one to press Enter (e.g. CI); catch late requests and move on
+                page.wait_for_timeout(NON_INTERACTIVE_WAIT)
+
+            # Re-save so requests made during manual interaction are kept
+            findings['tariff_endpoint'] = find_tariff_endpoint(api_requests)
+            with open('page_inspection.json', 'wb') as f:
+                f.write(orjson.dumps(findings, option=orjson.OPT_INDENT_2))
+            if findings['tariff_endpoint']:
+                print(f"Tariff endpoint: {findings['tariff_endpoint']['url']}")
+        finally:
+            # Save the trace even if the inspection failed; that is when
+            # it is most useful
+            context.tracing.stop(path=TRACE_PATH)
+            print(f"Trace saved to {TRACE_PATH}")
 
         browser.close()
 
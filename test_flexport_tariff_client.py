@@ -0,0 +1,296 @@
+"""
+Tests for the pure helpers in flexport_tariff_client.py.
+
+These cover caching, payload parsing and request matching, none of
+which needs a browser; requests and responses are stand-in objects
+carrying only the attributes the helpers read.
+"""
+
+import shelve
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from flexport_tariff_client import (
+    SELECTORS,
+    PooledPage,
+    SearchCache,
+    TariffCache,
+    TariffResult,
+    build_tariff_payload,
+    exact_text,
+    is_tariff_response,
+    parse_tariff_body,
+    parse_tariff_payload,
+    replay_headers,
+    should_block_request,
+    tariff_names,
+    word_text,
+)
+
+
+ARGUMENTS = {
+    "hts_code": "6203.42.4015",
+    "country_of_origin": "CN",
+    "shipment_value": 10000.0,
+    "entry_date": "2025-01-15",
+    "quantity": None,
+    "unit": None,
+}
+
+
+def make_response(url, method="POST", resource_type="fetch"):
+    return SimpleNamespace(url=url, request=SimpleNamespace(method=method, resource_type=resource_type))
+
+
+def make_request(url, resource_type="fetch"):
+    return SimpleNamespace(url=url, resource_type=resource_type)
+
+
+def make_pooled_page(url="https://tariffs.flexport.com/"):
+    page = MagicMock()
+    page.url = url
+    return PooledPage(page, SELECTORS)
+
+
+def test_pooled_page_reuses_page_after_payload_read():
+    entry = make_pooled_page()
+    assert not entry.needs_reload("https://tariffs.flexport.com")
+
+    entry.has_results = True
+    entry.mark_payload_read()
+    assert not entry.needs_reload("https://tariffs.flexport.com")
+    assert entry.shows_calculation
+
+
+def test_pooled_page_reloads_after_dom_read():
+    entry = make_pooled_page()
+    entry.has_results = True
+    assert entry.needs_reload("https://tariffs.flexport.com")
+
+    entry.mark_loaded()
+    assert not entry.needs_reload("https://tariffs.flexport.com")
+    assert not entry.shows_calculation
+
+
+def test_pooled_page_reloads_after_routing_away():
+    assert make_pooled_page("https://tariffs.flexport.com/about").needs_reload("https://tariffs.flexport.com")
+
+
+def test_cache_key_normalizes_inputs():
+    assert TariffCache.make_key(" 6203.42.4015 ", "cn", 10000.004, "2025-01-15") == \
+        TariffCache.make_key("6203.42.4015", "CN", 10000.0, "2025-01-15")
+
+
+def test_cache_past_entry_date_never_expires(monkeypatch):
+    cache = TariffCache(ttl=60)
+    key = TariffCache.make_key("6203.42.4015", "CN", 100.0, "2000-01-01")
+    cache.set(key, TariffResult(duty_rate="16.6%"))
+
+    monkeypatch.setattr(time, "time", lambda: 10 ** 12)
+    assert cache.get(key).duty_rate == "16.6%"
+
+
+def test_cache_today_expires_after_ttl(monkeypatch):
+    cache = TariffCache(ttl=60)
+    key = TariffCache.make_key("6203.42.4015", "CN", 100.0, "9999-12-31")
+    now = time.time()
+    cache.set(key, TariffResult(duty_rate="16.6%"))
+
+    monkeypatch.setattr(time, "time", lambda: now + 30)
+    assert cache.get(key).duty_rate == "16.6%"
+    monkeypatch.setattr(time, "time", lambda: now + 120)
+    assert cache.get(key) is None
+
+
+def test_cache_shelve_round_trip(tmp_path):
+    path = str(tmp_path / "tariffs")
+    key = TariffCache.make_key("6203.42.4015", "CN", 100.0, "2000-01-01")
+    cache = TariffCache(path)
+    cache.set(key, TariffResult(duty_rate="16.6%", applicable_tariffs=["Section 301"]))
+    cache.close()
+
+    reopened = TariffCache(path)
+    assert reopened.get(key) == TariffResult(duty_rate="16.6%", applicable_tariffs=["Section 301"])
+    reopened.close()
+
+
+def test_cache_unreadable_entry_is_a_miss(tmp_path):
+    path = str(tmp_path / "tariffs")
+    key = TariffCache.make_key("6203.42.4015", "CN", 100.0, "2000-01-01")
+    with shelve.open(path) as shelf:
+        shelf.dict[TariffCache._disk_key(key).encode()] = b"\x80\x04not a pickle"
+
+    cache = TariffCache(path)
+    assert cache.get(key) is None
+    cache.close()
+
+
+def test_cache_returns_copies():
+    cache = TariffCache()
+    key = TariffCache.make_key("6203.42.4015", "CN", 100.0, "2000-01-01")
+    result = TariffResult(duty_rate="16.6%")
+    cache.set(key, result)
+    result.duty_rate = "changed"
+    cache.get(key).applicable_tariffs.append("changed")
+
+    assert cache.get(key) == TariffResult(duty_rate="16.6%")
+
+
+def test_cache_remember_skips_results_without_values():
+    cache = TariffCache()
+    key = TariffCache.make_key("6203.42.4015", "CN", 100.0, "2000-01-01")
+    cache.remember(key, TariffResult(hts_description="Trousers"))
+    cache.remember(key, TariffResult(duty_rate="16.6%", error="partial"))
+    assert cache.get(key) is None
+
+    cache.remember(key, TariffResult(duty_rate="16.6%"))
+    assert cache.get(key).duty_rate == "16.6%"
+
+
+def test_search_cache_skips_empty_results():
+    cache = SearchCache()
+    key = SearchCache.make_key("  Laptop   computer ", 5)
+    assert key == ("laptop computer", 5)
+
+    cache.remember(key, [])
+    assert cache.get(key) is None
+    cache.remember(key, [{"hts_code": "8471.30.0100", "description": "Laptops"}])
+    assert cache.get(key) == [{"hts_code": "8471.30.0100", "description": "Laptops"}]
+
+
+def test_build_payload_without_template_drops_unset_optionals():
+    assert build_tariff_payload(ARGUMENTS) == {
+        "hts_code": "6203.42.4015",
+        "country_of_origin": "CN",
+        "shipment_value": 10000.0,
+        "entry_date": "2025-01-15",
+    }
+
+
+def test_build_payload_keeps_template_keys():
+    template = {"htsCode": "0000", "countryOfOrigin": "MX", "customsValue": 1, "currency": "USD"}
+    assert build_tariff_payload(ARGUMENTS, template) == {
+        "htsCode": "6203.42.4015",
+        "countryOfOrigin": "CN",
+        "customsValue": 10000.0,
+        "currency": "USD",
+        "entry_date": "2025-01-15",
+    }
+
+
+def test_build_payload_deletes_captured_optional_set_to_none():
+    template = {"htsCode": "0000", "qty": 12, "uom": "kg"}
+    payload = build_tariff_payload(dict(ARGUMENTS, unit="doz"), template)
+    assert "qty" not in payload
+    assert payload["uom"] == "doz"
+
+
+def test_build_payload_rewrites_graphql_variables():
+    template = {
+        "operationName": "CalculateTariff",
+        "query": "mutation CalculateTariff($htsCode: String!) { ... }",
+        "variables": {"htsCode": "0000", "origin": "MX", "quantity": 3},
+    }
+    payload = build_tariff_payload(ARGUMENTS, template)
+    assert payload["operationName"] == "CalculateTariff"
+    assert payload["query"] == template["query"]
+    assert payload["variables"]["htsCode"] == "6203.42.4015"
+    assert payload["variables"]["origin"] == "CN"
+    assert "quantity" not in payload["variables"]
+    assert template["variables"]["htsCode"] == "0000"
+
+
+def test_parse_payload_unwraps_data_envelope():
+    result = parse_tariff_payload({"data": {"htsCode": "6203.42.4015", "dutyRate": 16.6}})
+    assert result.hts_code == "6203.42.4015"
+    assert result.duty_rate == "16.6"
+
+
+@pytest.mark.parametrize("payload", [
+    {"data": {"description": "Trousers"}},
+    {"origin": "CN", "tariffs": []},
+    ["dutyRate"],
+    None,
+])
+def test_parse_payload_without_values(payload):
+    assert parse_tariff_payload(payload) is None
+
+
+def test_parse_body_rejects_non_json():
+    assert parse_tariff_body(b"<html></html>") is None
+    assert parse_tariff_body(b'{"totalLandedCost": "11660.00"}').total_landed_cost == "11660.00"
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("Section 301", ["Section 301"]),
+    (["Section 301", None, 232], ["Section 301", "232"]),
+    ([{"section": "9903.88.03", "rate": 25}, {"name": "MFN"}], ["9903.88.03", "MFN"]),
+    ({"rate": 25}, ["{'rate': 25}"]),
+])
+def test_tariff_names(value, expected):
+    assert tariff_names(value) == expected
+
+
+@pytest.mark.parametrize("url, method, resource_type, expected", [
+    ("https://tariffs.flexport.com/api/calculate", "POST", "fetch", True),
+    ("https://tariffs.flexport.com/api/v1/duties", "POST", "xhr", True),
+    ("https://tariffs.flexport.com/api/calculate", "GET", "fetch", False),
+    ("https://tariffs.flexport.com/api/calculate", "POST", "document", False),
+    ("https://tariffs.flexport.com/api/config", "POST", "fetch", False),
+    ("https://tariffs.flexport.com/_next/static/chunk.js", "GET", "script", False),
+])
+def test_is_tariff_response_without_recorded_endpoint(url, method, resource_type, expected):
+    assert is_tariff_response(make_response(url, method, resource_type)) is expected
+
+
+def test_is_tariff_response_with_recorded_endpoint():
+    assert is_tariff_response(make_response("https://tariffs.flexport.com/graphql/"), "/graphql")
+    assert not is_tariff_response(make_response("https://tariffs.flexport.com/api/calculate"), "/graphql")
+
+
+@pytest.mark.parametrize("url, resource_type, expected", [
+    ("https://tariffs.flexport.com/logo.png", "image", True),
+    ("https://tariffs.flexport.com/app.css", "stylesheet", True),
+    ("https://www.google-analytics.com/collect", "fetch", True),
+    ("https://tariffs.flexport.com/api/calculate", "fetch", False),
+    ("https://tariffs.flexport.com/_next/static/chunk.js", "script", False),
+])
+def test_should_block_request(url, resource_type, expected):
+    assert should_block_request(make_request(url, resource_type)) is expected
+
+
+def test_exact_text_matches_whole_text_only():
+    pattern = exact_text("IN")
+    assert pattern.search(" in ")
+    assert not pattern.search("India")
+    assert not pattern.search("China")
+
+
+def test_word_text_matches_code_inside_option_text():
+    pattern = word_text("CN")
+    assert pattern.search("China (CN)")
+    assert pattern.search("CN - China")
+    assert not pattern.search("CNMI")
+    assert not word_text("IN").search("India")
+
+
+def test_replay_headers_drops_hop_by_hop_and_managed_headers():
+    headers = {
+        ":authority": "tariffs.flexport.com",
+        "Connection": "keep-alive",
+        "content-length": "120",
+        "content-type": "application/json",
+        "accept-encoding": "gzip, br",
+        "authorization": "Bearer token",
+        "x-csrf-token": "abc",
+        "referer": "https://tariffs.flexport.com/",
+    }
+    assert replay_headers(headers) == {
+        "authorization": "Bearer token",
+        "x-csrf-token": "abc",
+        "referer": "https://tariffs.flexport.com/",
+    }
+    assert replay_headers(None) == {}
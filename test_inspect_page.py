@@ -0,0 +1,161 @@
+"""
+Tests for the selector and endpoint helpers in inspect_page.py.
+
+These only exercise the pure functions that turn inspected element
+descriptors into selectors and captured requests into the tariff
+endpoint, so no browser is needed.
+"""
+
+import importlib.util
+
+from inspect_page import build_selectors, css_selector, find_element, find_tariff_endpoint, write_selectors_module
+
+
+def make_request(url, post_data=None, method='POST', resource_type='fetch'):
+    return {
+        'url': url,
+        'method': method,
+        'resource_type': resource_type,
+        'headers': {'x-csrf-token': 'abc'},
+        'post_data': post_data,
+    }
+
+
+def test_css_selector_prefers_stable_id():
+    info = {'id': 'hts-code', 'name': 'hts', 'placeholder': 'HTS code'}
+    assert css_selector('input', info) == '#hts-code'
+
+
+def test_css_selector_quotes_ids_that_are_not_css_identifiers():
+    assert css_selector('input', {'id': 'hts.code'}) == 'input[id="hts.code"]'
+
+
+def test_css_selector_skips_generated_id_for_name():
+    info = {'id': 'mui-12', 'name': 'origin', 'placeholder': 'Country'}
+    assert css_selector('input', info) == 'input[name="origin"]'
+
+
+def test_css_selector_skips_generated_id_for_placeholder():
+    info = {'id': ':r3:', 'placeholder': 'Entry date'}
+    assert css_selector('input', info) == 'input[placeholder="Entry date"]'
+
+
+def test_css_selector_keeps_ids_with_digits_that_are_not_generated():
+    assert css_selector('input', {'id': 'address1', 'name': 'street'}) == '#address1'
+    assert css_selector('input', {'id': 'step2-value', 'name': 'value'}) == '#step2-value'
+
+
+def test_css_selector_skips_generated_id_suffix():
+    info = {'id': 'headlessui-input-5', 'name': 'hts'}
+    assert css_selector('input', info) == 'input[name="hts"]'
+
+
+def test_css_selector_keeps_non_ascii_text():
+    info = {'placeholder': 'Valeur déclarée'}
+    assert css_selector('input', info) == 'input[placeholder="Valeur déclarée"]'
+
+
+def test_css_selector_falls_back_to_generated_id():
+    assert css_selector('input', {'id': 'mui-12'}) == '#mui-12'
+
+
+def test_css_selector_without_attributes():
+    assert css_selector('input', {'type': 'text'}) is None
+
+
+def test_find_element_prefers_keyword_over_earlier_type_match():
+    descriptors = [
+        {'type': 'number', 'name': 'qty'},
+        {'type': 'text', 'name': 'value'},
+    ]
+    assert find_element(descriptors, ('value',), ('number',)) == descriptors[1]
+
+
+def test_find_element_falls_back_to_type():
+    descriptors = [
+        {'type': 'text', 'name': 'hts'},
+        {'type': 'number', 'name': 'amount'},
+    ]
+    assert find_element(descriptors, ('value',), ('number',)) == descriptors[1]
+
+
+def test_find_element_matches_placeholder_case_insensitively():
+    descriptors = [{'type': 'text', 'placeholder': 'Search products'}]
+    assert find_element(descriptors, ('search',)) == descriptors[0]
+
+
+def test_find_element_without_match():
+    assert find_element([{'type': 'text', 'name': 'email'}], ('hts',), ('date',)) is None
+
+
+def test_build_selectors_value_input_ignores_earlier_number_field():
+    inputs = [
+        {'type': 'text', 'name': 'hts'},
+        {'type': 'number', 'name': 'qty'},
+        {'type': 'number', 'name': 'value'},
+    ]
+    selectors = build_selectors(inputs, [], [])
+    assert selectors['hts_input'] == 'input[name="hts"]'
+    assert selectors['value_input'] == 'input[name="value"]'
+
+
+def test_build_selectors_prefers_country_select():
+    selects = [{'name': 'countryOfOrigin', 'id': None}]
+    inputs = [{'type': 'text', 'placeholder': 'country'}]
+    selectors = build_selectors(inputs, selects, [])
+    assert selectors['country_input'] == 'select[name="countryOfOrigin"]'
+
+
+def test_build_selectors_calculate_button_by_text():
+    buttons = [
+        {'type': 'button', 'text': 'Reset'},
+        {'type': 'submit', 'text': ' Calculate '},
+    ]
+    assert build_selectors([], [], buttons)['calculate_button'] == 'button:has-text("Calculate")'
+
+
+def test_build_selectors_omits_unidentified_fields():
+    assert build_selectors([{'type': 'checkbox'}], [], []) == {}
+
+
+def test_write_selectors_module_round_trips(tmp_path):
+    selectors = {'hts_input': 'input[name="hts"]', 'value_input': '#value'}
+    path = tmp_path / 'tariff_selectors.py'
+    write_selectors_module(selectors, '2025-01-01T00:00:00Z', str(path))
+
+    spec = importlib.util.spec_from_file_location('tariff_selectors', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    assert module.SELECTORS == selectors
+    assert module.HTS_INPUT == 'input[name="hts"]'
+
+
+def test_find_tariff_endpoint_matches_path_not_host():
+    requests = [
+        make_request('https://tariffs.flexport.com/api/config'),
+        make_request('https://tariffs.flexport.com/api/calculate', '{"htsCode": "6203.42.4015"}'),
+    ]
+    assert find_tariff_endpoint(requests) == {
+        'url': 'https://tariffs.flexport.com/api/calculate',
+        'method': 'POST',
+        'headers': {'x-csrf-token': 'abc'},
+        'post_body': {'htsCode': '6203.42.4015'},
+    }
+
+
+def test_find_tariff_endpoint_skips_non_script_requests():
+    requests = [
+        make_request('https://tariffs.flexport.com/api/calculate', method='GET'),
+        make_request('https://tariffs.flexport.com/api/calculate', resource_type='document'),
+    ]
+    assert find_tariff_endpoint(requests) is None
+
+
+def test_find_tariff_endpoint_matches_graphql_operation():
+    requests = [
+        make_request('https://tariffs.flexport.com/graphql', '{"operationName": "Viewer", "query": "{ viewer { id } }"}'),
+        make_request('https://tariffs.flexport.com/graphql', '{"operationName": "CalculateTariff", "variables": {}}'),
+    ]
+    endpoint = find_tariff_endpoint(requests)
+    assert endpoint['url'] == 'https://tariffs.flexport.com/graphql'
+    assert endpoint['post_body']['operationName'] == 'CalculateTariff'